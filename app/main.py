@@ -2,37 +2,69 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.routes import classify, route
+from app.services.gmail_service import get_gmail_service
+from app.services.jira_service import get_jira_service
+from app.services.model_service import EXECUTOR, get_classifier, get_scheduler
+from app.services.slack_service import get_slack_service
+from app.services.watsonx_service import get_watsonx_service
 from app.utils.config import settings
+from app.utils.http import aclose_http_client
 from app.utils.logger import logger
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events"""
     # Startup
-    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    logger.info("Starting %s v%s", settings.APP_NAME, settings.APP_VERSION)
     logger.info("Loading AI models and services...")
     
-    # Pre-load services
+    # Pre-load the model on the inference pool so the first request does not pay for it
     try:
-        from app.services.model_service import get_classifier
-        classifier = get_classifier()
+        await asyncio.get_running_loop().run_in_executor(EXECUTOR, get_classifier().load)
         logger.info("Classifier loaded successfully")
     except Exception as e:
-        logger.warning(f"Could not pre-load classifier: {e}")
+        logger.warning("Could not pre-load classifier: %s", e)
+    
+    # Authenticate integrations up front so the first request does not pay for it
+    for service_name, get_service in (
+        ("Gmail", get_gmail_service),
+        ("Jira", get_jira_service),
+        ("Slack", get_slack_service),
+        ("watsonx", get_watsonx_service),
+    ):
+        try:
+            get_service()
+        except Exception as e:
+            logger.warning("Could not initialize %s service: %s", service_name, e)
+    
+    # The watsonx SDK is imported lazily; load it now instead of on the first request
+    await asyncio.to_thread(get_watsonx_service().load)
+    
+    # Warm the Jira and Slack connection pools so the first /route skips the TLS handshake
+    app.state.warmup_failures = []
+    if not await get_jira_service().warmup():
+        app.state.warmup_failures.append("jira")
+    if not await get_slack_service().warmup():
+        app.state.warmup_failures.append("slack")
+    
+    get_scheduler().start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down application...")
+    await get_scheduler().stop()
+    await aclose_http_client()
 
 
 # Create FastAPI app
@@ -40,6 +72,7 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="AI-powered support ticket triage and routing system",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -76,9 +109,15 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    warmup_failures = getattr(app.state, "warmup_failures", [])
+    if warmup_failures:
+        return {
+            "status": "degraded",
+            "error": f"Connection warmup failed for: {', '.join(warmup_failures)}"
+        }
+    
     try:
         # Check if services are available
-        from app.services.model_service import get_classifier
         classifier = get_classifier()
         
         return {
@@ -95,6 +134,12 @@ async def health_check():
         }
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Classifier result cache statistics"""
+    return get_classifier().cache_stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,27 +1,32 @@
 """Classification route handlers"""
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from typing import Optional
-import logging
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, Optional
+from starlette.concurrency import iterate_in_threadpool
+import asyncio
+import orjson
 
-from app.services.model_service import get_classifier
+from app.services.model_service import TicketTooLong, classifier_text, get_scheduler
 from app.services.watsonx_service import get_watsonx_service
+from app.utils.config import settings
 from app.utils.logger import logger
 
 router = APIRouter(prefix="/classify", tags=["classification"])
-logger = logging.getLogger(__name__)
 
 
 class TicketRequest(BaseModel):
     """Request model for ticket classification"""
-    text: str = Field(..., description="The ticket text to classify")
+    text: str = Field(..., max_length=settings.MAX_TICKET_CHARS, description="The ticket text to classify")
     include_suggestion: bool = Field(False, description="Whether to include AI-generated reply suggestion")
     include_summary: bool = Field(False, description="Whether to include ticket summary")
 
 
 class ClassificationResponse(BaseModel):
     """Response model for classification"""
+    model_config = ConfigDict(validate_assignment=False)
+    
     category: str
     confidence: float
     scores: dict
@@ -30,6 +35,11 @@ class ClassificationResponse(BaseModel):
     summary: Optional[str] = None
 
 
+def _sse(event: str, data: dict) -> bytes:
+    """Encode one Server-Sent Event"""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
 @router.post("", response_model=ClassificationResponse)
 async def classify_ticket(request: TicketRequest):
     """
@@ -39,39 +49,89 @@ async def classify_ticket(request: TicketRequest):
     - **include_suggestion**: Optionally generate a suggested reply
     - **include_summary**: Optionally generate a ticket summary
     """
+    # Watsonx calls are started as soon as their inputs exist
+    watsonx_tasks: Dict[str, asyncio.Task] = {}
     try:
-        # Get classifier
-        classifier = get_classifier()
+        text = classifier_text(request.text)
+        
+        # The summary does not depend on the category, so it overlaps classification
+        if request.include_summary:
+            watsonx_tasks["summary"] = asyncio.create_task(
+                get_watsonx_service().asummarize_ticket(request.text)
+            )
         
         # Classify ticket
-        classification = classifier.classify(request.text)
+        classification = await get_scheduler().submit(text)
         
-        response_data = {
-            "category": classification["category"],
-            "confidence": classification["confidence"],
-            "scores": classification["scores"],
-            "model": classification["model"]
-        }
+        response = ClassificationResponse(
+            category=classification["category"],
+            confidence=classification["confidence"],
+            scores=classification["scores"],
+            model=classification["model"]
+        )
         
         # Optionally generate AI suggestions
-        if request.include_suggestion or request.include_summary:
-            watsonx = get_watsonx_service()
-            
-            if request.include_suggestion:
-                suggestion_result = watsonx.suggest_reply(
-                    request.text,
-                    classification["category"]
-                )
-                response_data["suggestion"] = suggestion_result.get("text", "")
-            
-            if request.include_summary:
-                summary_result = watsonx.summarize_ticket(request.text)
-                response_data["summary"] = summary_result.get("text", "")
+        if request.include_suggestion:
+            watsonx_tasks["suggestion"] = asyncio.create_task(
+                get_watsonx_service().asuggest_reply(request.text, classification["category"])
+            )
+        
+        if watsonx_tasks:
+            results = await asyncio.gather(*watsonx_tasks.values())
+            for field, result in zip(watsonx_tasks, results):
+                setattr(response, field, result.get("text", ""))
         
-        logger.info(f"Classified ticket as '{classification['category']}'")
-        return ClassificationResponse(**response_data)
+        logger.info("Classified ticket as '%s'", classification['category'])
+        return response
         
+    except HTTPException:
+        raise
+    except TicketTooLong as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
-        logger.error(f"Error classifying ticket: {e}")
+        logger.error("Error classifying ticket: %s", e)
         raise HTTPException(status_code=500, detail=f"Classification error: {str(e)}")
+    finally:
+        # Drop watsonx work nobody will read if classification failed
+        for task in watsonx_tasks.values():
+            task.cancel()
+
+
+@router.post("/stream")
+async def classify_ticket_stream(request: TicketRequest):
+    """
+    Classify a support ticket and stream a suggested reply as Server-Sent Events
+    
+    Emits a `classification` event with the category, confidence, scores
+    and model, then `suggestion` events carrying reply text chunks as
+    watsonx generates them, and finally a `done` event (or an `error` event
+    if generation fails midway).
+    
+    - **text**: The ticket content to classify
+    """
+    try:
+        text = classifier_text(request.text)
+        classification = await get_scheduler().submit(text)
+        chunks = get_watsonx_service().stream_suggest_reply(request.text, classification["category"])
+    except HTTPException:
+        raise
+    except TicketTooLong as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        logger.error("Error classifying ticket: %s", e)
+        raise HTTPException(status_code=500, detail=f"Classification error: {str(e)}")
+    
+    async def events():
+        yield _sse("classification", classification)
+        try:
+            # The SDK stream blocks, so each chunk is pulled on a worker thread
+            async for chunk in iterate_in_threadpool(chunks):
+                yield _sse("suggestion", {"text": chunk})
+        except Exception as e:
+            logger.error("Error streaming suggestion: %s", e)
+            yield _sse("error", {"detail": str(e)})
+            return
+        yield _sse("done", {})
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
 
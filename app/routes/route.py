@@ -1,134 +1,258 @@
 """Routing route handlers"""
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from typing import Optional
-import logging
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Dict, List, Optional
+import asyncio
+import orjson
 
-from app.services.model_service import get_classifier
+from app.services.model_service import EXECUTOR, TicketClassifier, TicketTooLong, classifier_text, get_classifier, get_scheduler
 from app.services.jira_service import get_jira_service
 from app.services.slack_service import get_slack_service
 from app.services.gmail_service import get_gmail_service
-from app.utils.config import settings
+from app.utils.config import RoutingConfig, settings
 from app.utils.logger import logger
 
 router = APIRouter(prefix="/route", tags=["routing"])
-logger = logging.getLogger(__name__)
 
 
 class RouteRequest(BaseModel):
     """Request model for ticket routing"""
     ticket_id: str = Field(..., description="Unique ticket identifier")
-    text: str = Field(..., description="The ticket text to route")
+    text: str = Field(..., max_length=settings.MAX_TICKET_CHARS, description="The ticket text to route")
     subject: Optional[str] = Field(None, description="Ticket subject")
     from_email: Optional[str] = Field(None, description="Sender email address")
     create_jira: bool = Field(True, description="Whether to create Jira issue")
     send_slack: bool = Field(True, description="Whether to send Slack notification")
+    category: Optional[str] = Field(
+        None,
+        description="Known category for an already classified ticket; skips classification"
+    )
+    
+    @field_validator("category")
+    @classmethod
+    def validate_category(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and value not in TicketClassifier.CATEGORIES:
+            raise ValueError(f"category must be one of {', '.join(TicketClassifier.CATEGORIES)}")
+        return value
 
 
 class RouteResponse(BaseModel):
     """Response model for routing"""
+    model_config = ConfigDict(validate_assignment=False)
+    
     ticket_id: str
     category: str
     confidence: float
     jira_issue: Optional[dict] = None
     slack_message: Optional[dict] = None
-    routing_config: dict
+    routing_config: RoutingConfig
 
 
-@router.post("", response_model=RouteResponse)
-async def route_ticket(request: RouteRequest):
-    """
-    Classify and route a support ticket
+# Routing for categories without an entry in CATEGORY_ROUTING
+_DEFAULT_ROUTING = RoutingConfig(jira_priority="Medium", slack_channel=settings.SLACK_CHANNEL_ID)
+
+
+async def _do_jira(request: RouteRequest, category: str, routing_config: RoutingConfig) -> dict:
+    """Create the Jira issue for a classified ticket"""
+    jira_service = get_jira_service()
+    summary = request.subject or f"{category.title()} Ticket: {request.ticket_id}"
+    description = f"Ticket ID: {request.ticket_id}\n\n{request.text}"
+    if request.from_email:
+        description += f"\n\nFrom: {request.from_email}"
     
-    This endpoint:
-    1. Classifies the ticket using AI
-    2. Creates a Jira issue (if enabled)
-    3. Sends a Slack notification (if enabled)
+    return await jira_service.create_issue(
+        summary=summary,
+        description=description,
+        issue_type="Task",
+        priority=routing_config.jira_priority,
+        labels=[category, "ai-triaged"],
+        ticket_id=request.ticket_id
+    )
+
+
+async def _do_slack(request: RouteRequest, category: str, jira_key: Optional[str]) -> dict:
+    """Send the Slack notification for a classified ticket"""
+    slack_service = get_slack_service()
+    summary = request.subject or f"Ticket {request.ticket_id}"
     
-    - **ticket_id**: Unique identifier for the ticket
-    - **text**: The ticket content
-    - **subject**: Optional ticket subject
-    - **from_email**: Optional sender email
-    - **create_jira**: Whether to create Jira issue
-    - **send_slack**: Whether to send Slack notification
-    """
+    return await slack_service.send_ticket_notification(
+        ticket_id=request.ticket_id,
+        category=category,
+        summary=summary,
+        jira_key=jira_key
+    )
+
+
+async def _route(request: RouteRequest, classification: Optional[Dict] = None) -> RouteResponse:
+    """Classify (unless already classified) and route one ticket"""
     try:
-        # Classify ticket
-        classifier = get_classifier()
-        classification = classifier.classify(request.text)
-        category = classification["category"]
-        confidence = classification["confidence"]
+        # Classify ticket, unless the caller already knows its category
+        if request.category:
+            category = request.category
+            confidence = 1.0
+        else:
+            if classification is None:
+                classification = await get_scheduler().submit(classifier_text(request.text))
+            category = classification["category"]
+            confidence = classification["confidence"]
         
         # Get routing configuration
-        routing_config = settings.CATEGORY_ROUTING.get(category, {
-            "jira_priority": "Medium",
-            "slack_channel": settings.SLACK_CHANNEL_ID
-        })
+        routing_config = settings.CATEGORY_ROUTING.get(category, _DEFAULT_ROUTING)
         
-        response_data = {
-            "ticket_id": request.ticket_id,
-            "category": category,
-            "confidence": confidence,
-            "routing_config": routing_config
-        }
+        response = RouteResponse(
+            ticket_id=request.ticket_id,
+            category=category,
+            confidence=confidence,
+            routing_config=routing_config
+        )
         
         # Create Jira issue
         jira_issue = None
         if request.create_jira:
-            jira_service = get_jira_service()
-            summary = request.subject or f"{category.title()} Ticket: {request.ticket_id}"
-            description = f"Ticket ID: {request.ticket_id}\n\n{request.text}"
-            if request.from_email:
-                description += f"\n\nFrom: {request.from_email}"
-            
-            jira_issue = jira_service.create_issue(
-                summary=summary,
-                description=description,
-                issue_type="Task",
-                priority=routing_config.get("jira_priority", "Medium"),
-                labels=[category, "ai-triaged"]
-            )
-            response_data["jira_issue"] = jira_issue
+            jira_issue = await _do_jira(request, category, routing_config)
+            response.jira_issue = jira_issue
         
-        # Send Slack notification
-        slack_message = None
+        # Send Slack notification (links the Jira issue, so it runs after it)
         if request.send_slack:
-            slack_service = get_slack_service()
-            summary = request.subject or f"Ticket {request.ticket_id}"
             jira_key = jira_issue.get("issue_key") if jira_issue and jira_issue.get("success") else None
-            
-            slack_message = slack_service.send_ticket_notification(
-                ticket_id=request.ticket_id,
-                category=category,
-                summary=summary,
-                jira_key=jira_key
-            )
-            response_data["slack_message"] = slack_message
+            response.slack_message = await _do_slack(request, category, jira_key)
         
-        logger.info(f"Routed ticket {request.ticket_id} as '{category}'")
-        return RouteResponse(**response_data)
+        logger.info("Routed ticket %s as '%s'", request.ticket_id, category)
+        return response
         
+    except HTTPException:
+        raise
+    except TicketTooLong as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
-        logger.error(f"Error routing ticket: {e}")
+        logger.error("Error routing ticket: %s", e)
         raise HTTPException(status_code=500, detail=f"Routing error: {str(e)}")
 
 
+@router.post("", response_model=RouteResponse)
+async def route_ticket(request: RouteRequest):
+    """
+    Classify and route a support ticket
+    
+    This endpoint:
+    1. Classifies the ticket using AI
+    2. Creates a Jira issue (if enabled)
+    3. Sends a Slack notification (if enabled)
+    
+    - **ticket_id**: Unique identifier for the ticket
+    - **text**: The ticket content
+    - **subject**: Optional ticket subject
+    - **from_email**: Optional sender email
+    - **create_jira**: Whether to create Jira issue
+    - **send_slack**: Whether to send Slack notification
+    - **category**: Optional known category; skips classification
+    """
+    return await _route(request)
+
+
+async def _classify_tickets(tickets: List[RouteRequest]) -> List[Optional[Dict]]:
+    """
+    Classify every ticket of a batch that has no preset category in one model call
+    
+    Tickets that are preset or rejected by the length check get None and are
+    handled per ticket by _route.
+    """
+    classifications: List[Optional[Dict]] = [None] * len(tickets)
+    positions, texts = [], []
+    for i, ticket in enumerate(tickets):
+        if ticket.category:
+            continue
+        try:
+            texts.append(classifier_text(ticket.text))
+        except TicketTooLong:
+            continue
+        positions.append(i)
+    
+    if texts:
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(EXECUTOR, get_classifier().classify_batch, texts)
+        for i, result in zip(positions, results):
+            classifications[i] = result
+    return classifications
+
+
+async def _route_batch_item(
+    ticket: RouteRequest,
+    classification: Optional[Dict],
+    semaphore: asyncio.Semaphore
+) -> dict:
+    """Route one ticket of a batch, reporting a failure as an error entry"""
+    async with semaphore:
+        try:
+            result = await _route(ticket, classification)
+        except Exception as e:
+            logger.error("Error routing ticket %s in batch: %s", ticket.ticket_id, e)
+            return {
+                "ticket_id": ticket.ticket_id,
+                "error": getattr(e, "detail", str(e))
+            }
+    return result.model_dump()
+
+
 @router.post("/batch")
 async def route_tickets_batch(tickets: list[RouteRequest]):
     """
     Route multiple tickets in batch
     
-    Accepts a list of tickets and processes them in parallel
+    Accepts a list of tickets, classifies them together in one batched
+    model call, then routes them concurrently, at most BATCH_CONCURRENCY at
+    a time. A ticket that fails to route is reported as an error entry in
+    the results instead of failing the whole batch.
     """
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+    
     try:
-        results = []
-        for ticket in tickets:
-            result = await route_ticket(ticket)
-            results.append(result.dict())
+        classifications = await _classify_tickets(tickets)
+        results = await asyncio.gather(
+            *(
+                _route_batch_item(ticket, classification, semaphore)
+                for ticket, classification in zip(tickets, classifications)
+            )
+        )
         
         return {"processed": len(results), "results": results}
     except Exception as e:
-        logger.error(f"Error in batch routing: {e}")
+        logger.error("Error in batch routing: %s", e)
         raise HTTPException(status_code=500, detail=f"Batch routing error: {str(e)}")
 
+
+@router.post("/batch/stream")
+async def route_tickets_batch_stream(tickets: list[RouteRequest]):
+    """
+    Route multiple tickets in batch, streaming results as they complete
+    
+    Returns newline-delimited JSON with one result per line, in completion
+    order rather than request order, so clients can act on early results
+    while slower Jira/Slack calls are still in flight.
+    """
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+    
+    try:
+        classifications = await _classify_tickets(tickets)
+    except Exception as e:
+        logger.error("Error in batch routing: %s", e)
+        raise HTTPException(status_code=500, detail=f"Batch routing error: {str(e)}")
+    
+    async def generate():
+        # Routing starts only once the response streams, so a client that
+        # disconnects first never triggers Jira issues or Slack posts
+        tasks = [
+            asyncio.ensure_future(_route_batch_item(ticket, classification, semaphore))
+            for ticket, classification in zip(tickets, classifications)
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield orjson.dumps(await next_result) + b"\n"
+        finally:
+            # Stop outstanding work if the client disconnects mid-stream
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
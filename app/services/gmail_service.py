@@ -1,10 +1,10 @@
 """Gmail API service for fetching support tickets"""
 
-import base64
+import binascii
 import json
 from typing import List, Dict, Optional
 from datetime import datetime
-import logging
+import functools
 
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
@@ -14,12 +14,23 @@ from googleapiclient.errors import HttpError
 from app.utils.config import settings
 from app.utils.logger import logger
 
-logger = logging.getLogger(__name__)
+
+# Maps the URL-safe base64 alphabet used by Gmail onto the standard one
+_B64_TRANS = bytes.maketrans(b'-_', b'+/')
+
+
+def _b64url_decode(data: str) -> bytes:
+    """Decode URL-safe base64 straight through binascii, tolerating missing padding"""
+    raw = data.encode('ascii').translate(_B64_TRANS)
+    return binascii.a2b_base64(raw + b'=' * (-len(raw) % 4))
 
 
 class GmailService:
     """Service for interacting with Gmail API"""
     
+    # Gmail accepts at most 100 calls per batch request
+    BATCH_LIMIT = 100
+    
     def __init__(self):
         self.credentials = None
         self.service = None
@@ -43,16 +54,22 @@ class GmailService:
             else:
                 logger.warning("Gmail credentials not configured. Using mock mode.")
         except Exception as e:
-            logger.error(f"Gmail authentication error: {e}")
+            logger.error("Gmail authentication error: %s", e)
             logger.warning("Gmail service will operate in mock mode")
     
-    def fetch_tickets(self, query: str = "is:unread", max_results: int = 10) -> List[Dict]:
+    def fetch_tickets(
+        self,
+        query: str = "is:unread",
+        max_results: int = 10,
+        include_body: bool = True
+    ) -> List[Dict]:
         """
         Fetch support tickets from Gmail
         
         Args:
             query: Gmail search query (default: unread emails)
             max_results: Maximum number of tickets to fetch
+            include_body: Fetch message bodies; False fetches headers only
             
         Returns:
             List of ticket dictionaries
@@ -70,39 +87,66 @@ class GmailService:
             ).execute()
             
             messages = results.get('messages', [])
-            tickets = []
-            
-            for msg in messages:
-                ticket = self._parse_message(msg['id'])
-                if ticket:
-                    tickets.append(ticket)
+            tickets = self._fetch_messages([msg['id'] for msg in messages], include_body=include_body)
             
-            logger.info(f"Fetched {len(tickets)} tickets from Gmail")
+            logger.info("Fetched %s tickets from Gmail", len(tickets))
             return tickets
             
         except HttpError as e:
-            logger.error(f"Gmail API error: {e}")
+            logger.error("Gmail API error: %s", e)
             return self._get_mock_tickets()
         except Exception as e:
-            logger.error(f"Error fetching tickets: {e}")
+            logger.error("Error fetching tickets: %s", e)
             return self._get_mock_tickets()
     
-    def _parse_message(self, message_id: str) -> Optional[Dict]:
-        """Parse a Gmail message into a ticket format"""
+    def _fetch_messages(self, message_ids: List[str], include_body: bool = True) -> List[Dict]:
+        """Fetch and parse messages using Gmail batch requests instead of one call each"""
+        tickets_by_id = {}
+        
+        def on_message(request_id, response, exception):
+            if exception is not None:
+                logger.error("Error fetching message %s: %s", request_id, exception)
+                return
+            ticket = self._parse_message(response, include_body=include_body)
+            if ticket:
+                tickets_by_id[request_id] = ticket
+        
+        for start in range(0, len(message_ids), self.BATCH_LIMIT):
+            batch = self.service.new_batch_http_request(callback=on_message)
+            for message_id in message_ids[start:start + self.BATCH_LIMIT]:
+                batch.add(self._message_request(message_id, include_body), request_id=message_id)
+            batch.execute()
+        
+        # Preserve the order returned by the search
+        return [tickets_by_id[message_id] for message_id in message_ids if message_id in tickets_by_id]
+    
+    def _message_request(self, message_id: str, include_body: bool = True):
+        """Build the Gmail API request for a single message"""
+        messages = self.service.users().messages()
+        if include_body:
+            return messages.get(userId='me', id=message_id, format='full')
+        
+        # Headers only: a fraction of the size of the full MIME payload
+        return messages.get(
+            userId='me',
+            id=message_id,
+            format='metadata',
+            metadataHeaders=['Subject', 'From', 'Date']
+        )
+    
+    def _parse_message(self, message: Dict, include_body: bool = True) -> Optional[Dict]:
+        """Parse a Gmail message resource into a ticket format"""
+        message_id = message.get('id')
         try:
-            message = self.service.users().messages().get(
-                userId='me',
-                id=message_id,
-                format='full'
-            ).execute()
-            
             headers = message['payload'].get('headers', [])
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
-            sender = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown')
-            date = next((h['value'] for h in headers if h['name'] == 'Date'), '')
+            # Header names are case-insensitive (RFC 5322); normalize once
+            header_map = {h['name'].lower(): h['value'] for h in headers}
+            subject = header_map.get('subject', 'No Subject')
+            sender = header_map.get('from', 'Unknown')
+            date = header_map.get('date', '')
             
             # Extract body
-            body = self._extract_body(message['payload'])
+            body = self._extract_body(message['payload']) if include_body else ""
             
             return {
                 'id': message_id,
@@ -114,23 +158,20 @@ class GmailService:
                 'source': 'gmail'
             }
         except Exception as e:
-            logger.error(f"Error parsing message {message_id}: {e}")
+            logger.error("Error parsing message %s: %s", message_id, e)
             return None
     
     def _extract_body(self, payload: Dict) -> str:
-        """Extract email body from payload"""
-        body = ""
+        """Extract the text/plain email body from payload"""
+        parts = payload['parts'] if 'parts' in payload else (payload,)
         
-        if 'parts' in payload:
-            for part in payload['parts']:
-                if part['mimeType'] == 'text/plain':
-                    data = part['body']['data']
-                    body += base64.urlsafe_b64decode(data).decode('utf-8')
-        elif payload['mimeType'] == 'text/plain':
-            data = payload['body']['data']
-            body = base64.urlsafe_b64decode(data).decode('utf-8')
-        
-        return body
+        # Decode every text/plain part to bytes and join once instead of growing a str
+        chunks = [
+            _b64url_decode(part['body']['data'])
+            for part in parts
+            if part.get('mimeType') == 'text/plain' and part.get('body', {}).get('data')
+        ]
+        return b"".join(chunks).decode('utf-8', errors='replace')
     
     def _get_mock_tickets(self) -> List[Dict]:
         """Return mock tickets for testing when Gmail API is not available"""
@@ -166,13 +207,8 @@ class GmailService:
 
 
 # Global service instance
-_gmail_service_instance = None
-
-
+@functools.lru_cache(maxsize=1)
 def get_gmail_service() -> GmailService:
     """Get or create the global Gmail service instance"""
-    global _gmail_service_instance
-    if _gmail_service_instance is None:
-        _gmail_service_instance = GmailService()
-    return _gmail_service_instance
+    return GmailService()
 
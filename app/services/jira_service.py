@@ -1,14 +1,59 @@
 """Jira REST API service for creating and updating issues"""
 
-from typing import Dict, Optional
-import logging
-import requests
-from requests.auth import HTTPBasicAuth
+from typing import Dict, Optional, Tuple
+import functools
+import httpx
+import orjson
 
 from app.utils.config import settings
+from app.utils.http import get_http_client
 from app.utils.logger import logger
 
-logger = logging.getLogger(__name__)
+
+_ACCEPT_HEADERS = {"Accept": "application/json"}
+_JSON_HEADERS = {**_ACCEPT_HEADERS, "Content-Type": "application/json"}
+
+# Placeholders marking where the per-issue values go in a cached payload skeleton
+_SUMMARY_SLOT = "\u2063summary\u2063"
+_DESCRIPTION_SLOT = "\u2063description\u2063"
+
+
+def _adf_document(text: str) -> Dict:
+    """Wrap plain text in a single-paragraph Atlassian Document Format body"""
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {
+                "type": "paragraph",
+                "content": [{"type": "text", "text": text}]
+            }
+        ]
+    }
+
+
+@functools.lru_cache(maxsize=64)
+def _payload_skeleton(project_key: str, issue_type: str, priority: str, labels: Tuple[str, ...]) -> Tuple[bytes, bytes, bytes]:
+    """
+    Serialize the create-issue payload for one issue shape, minus its text
+    
+    Returns the JSON split into three byte segments around the summary and
+    description values, so a new issue only needs those two strings encoded.
+    """
+    fields = {
+        "project": {"key": project_key},
+        "summary": _SUMMARY_SLOT,
+        "description": _adf_document(_DESCRIPTION_SLOT),
+        "issuetype": {"name": issue_type},
+        "priority": {"name": priority}
+    }
+    if labels:
+        fields["labels"] = list(labels)
+    
+    payload = orjson.dumps({"fields": fields})
+    head, rest = payload.split(orjson.dumps(_SUMMARY_SLOT), 1)
+    middle, tail = rest.split(orjson.dumps(_DESCRIPTION_SLOT), 1)
+    return head, middle, tail
 
 
 class JiraService:
@@ -20,30 +65,36 @@ class JiraService:
         self.api_token = settings.JIRA_API_TOKEN
         self.project_key = settings.JIRA_PROJECT_KEY
         self.auth = None
+        self._issue_url = f"{self.url}/rest/api/3/issue"
+        self._basic_auth: Optional[httpx.BasicAuth] = None
         
         if self.email and self.api_token:
-            self.auth = HTTPBasicAuth(self.email, self.api_token)
+            self.auth = (self.email, self.api_token)
+            # Credentials travel per request; the connection pool is shared process-wide
+            self._basic_auth = httpx.BasicAuth(self.email, self.api_token)
             logger.info("Jira service initialized with credentials")
         else:
             logger.warning("Jira credentials not configured. Using mock mode.")
     
-    def create_issue(
+    async def create_issue(
         self,
         summary: str,
         description: str,
         issue_type: str = "Task",
         priority: str = "Medium",
-        labels: Optional[list] = None
+        labels: Optional[list] = None,
+        ticket_id: Optional[str] = None
     ) -> Dict:
         """
         Create a new Jira issue
         
         Args:
             summary: Issue summary/title
-            description: Issue description
+            description: Issue description, truncated to JIRA_DESC_MAX characters
             issue_type: Type of issue (Task, Bug, Story, etc.)
             priority: Issue priority (Low, Medium, High, Critical)
             labels: Optional list of labels
+            ticket_id: Optional source ticket, referenced when the description is truncated
             
         Returns:
             Dictionary with issue details or error
@@ -52,46 +103,22 @@ class JiraService:
             logger.warning("Jira not configured, returning mock issue")
             return self._create_mock_issue(summary, description, priority)
         
+        if len(description) > settings.JIRA_DESC_MAX:
+            note = f"\n\n[Truncated, see ticket {ticket_id} for the full text]" if ticket_id else "\n\n[Truncated]"
+            description = description[:settings.JIRA_DESC_MAX - len(note)] + note
+        
         try:
-            url = f"{self.url}/rest/api/3/issue"
+            # Same-shaped issues share one serialized skeleton; only the text is encoded here
+            head, middle, tail = _payload_skeleton(self.project_key, issue_type, priority, tuple(labels or ()))
+            content = head + orjson.dumps(summary) + middle + orjson.dumps(description) + tail
             
-            payload = {
-                "fields": {
-                    "project": {"key": self.project_key},
-                    "summary": summary,
-                    "description": {
-                        "type": "doc",
-                        "version": 1,
-                        "content": [
-                            {
-                                "type": "paragraph",
-                                "content": [
-                                    {
-                                        "type": "text",
-                                        "text": description
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    "issuetype": {"name": issue_type},
-                    "priority": {"name": priority}
-                }
-            }
-            
-            if labels:
-                payload["fields"]["labels"] = labels
-            
-            response = requests.post(
-                url,
-                json=payload,
-                auth=self.auth,
-                headers={"Accept": "application/json", "Content-Type": "application/json"}
+            response = await get_http_client().post(
+                self._issue_url, content=content, headers=_JSON_HEADERS, auth=self._basic_auth
             )
             
             if response.status_code == 201:
                 issue_data = response.json()
-                logger.info(f"Created Jira issue: {issue_data.get('key')}")
+                logger.info("Created Jira issue: %s", issue_data.get('key'))
                 return {
                     "success": True,
                     "issue_key": issue_data.get("key"),
@@ -107,13 +134,13 @@ class JiraService:
                 }
                 
         except Exception as e:
-            logger.error(f"Error creating Jira issue: {e}")
+            logger.error("Error creating Jira issue: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    def update_issue(
+    async def update_issue(
         self,
         issue_key: str,
         summary: Optional[str] = None,
@@ -137,22 +164,13 @@ class JiraService:
             return {"success": True, "message": "Mock update successful"}
         
         try:
-            url = f"{self.url}/rest/api/3/issue/{issue_key}"
+            url = f"{self._issue_url}/{issue_key}"
             
             fields = {}
             if summary:
                 fields["summary"] = summary
             if description:
-                fields["description"] = {
-                    "type": "doc",
-                    "version": 1,
-                    "content": [
-                        {
-                            "type": "paragraph",
-                            "content": [{"type": "text", "text": description}]
-                        }
-                    ]
-                }
+                fields["description"] = _adf_document(description)
             if priority:
                 fields["priority"] = {"name": priority}
             
@@ -161,15 +179,12 @@ class JiraService:
             
             payload = {"fields": fields}
             
-            response = requests.put(
-                url,
-                json=payload,
-                auth=self.auth,
-                headers={"Accept": "application/json", "Content-Type": "application/json"}
+            response = await get_http_client().put(
+                url, content=orjson.dumps(payload), headers=_JSON_HEADERS, auth=self._basic_auth
             )
             
             if response.status_code == 204:
-                logger.info(f"Updated Jira issue: {issue_key}")
+                logger.info("Updated Jira issue: %s", issue_key)
                 return {"success": True, "issue_key": issue_key}
             else:
                 error_msg = f"Failed to update Jira issue: {response.status_code} - {response.text}"
@@ -177,9 +192,24 @@ class JiraService:
                 return {"success": False, "error": error_msg}
                 
         except Exception as e:
-            logger.error(f"Error updating Jira issue: {e}")
+            logger.error("Error updating Jira issue: %s", e)
             return {"success": False, "error": str(e)}
     
+    async def warmup(self) -> bool:
+        """Open the pooled connection to Jira before the first issue is created"""
+        if not self.auth:
+            return True
+        
+        try:
+            response = await get_http_client().get(
+                f"{self.url}/rest/api/3/myself", headers=_ACCEPT_HEADERS, auth=self._basic_auth
+            )
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            logger.warning("Jira warmup failed: %s", e)
+            return False
+    
     def _create_mock_issue(self, summary: str, description: str, priority: str) -> Dict:
         """Create a mock issue for testing"""
         import random
@@ -194,13 +224,8 @@ class JiraService:
 
 
 # Global service instance
-_jira_service_instance = None
-
-
+@functools.lru_cache(maxsize=1)
 def get_jira_service() -> JiraService:
     """Get or create the global Jira service instance"""
-    global _jira_service_instance
-    if _jira_service_instance is None:
-        _jira_service_instance = JiraService()
-    return _jira_service_instance
+    return JiraService()
 
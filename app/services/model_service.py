@@ -1,99 +1,345 @@
 """Hugging Face Transformer model service for ticket classification"""
 
-try:
-    import torch
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification
-    TORCH_AVAILABLE = True
-except ImportError:
-    TORCH_AVAILABLE = False
-    torch = None
-
-from typing import Dict, List, Tuple
-import logging
-import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+import asyncio
+import contextlib
+import functools
+import threading
 
+from app.utils.cache import LRUCache, text_key
 from app.utils.config import settings
 from app.utils.logger import logger
 
-logger = logging.getLogger(__name__)
+
+# numpy, torch and transformers are imported by _ensure_torch on first use; importing
+# them costs seconds and hundreds of MB, which routes that never classify skip
+np = None
+torch = None
+AutoTokenizer = None
+AutoModelForSequenceClassification = None
+
+# Bounded pool that runs blocking inference off the event loop
+EXECUTOR = ThreadPoolExecutor(max_workers=settings.INFER_THREADS, thread_name_prefix="classifier")
+
+# Keywords that vote for each category in mock mode
+_MOCK_KEYWORDS = {
+    "billing": ["payment", "invoice", "billing", "charge", "refund", "subscription", "price", "cost"],
+    "technical": ["error", "bug", "crash", "not working", "broken", "issue", "problem", "technical"],
+    "access": ["login", "password", "access", "account", "permission", "unauthorized", "locked"],
+    "bug_report": ["bug", "error", "crash", "broken", "defect"],
+    "feature_request": ["feature", "request", "suggestion", "improvement", "enhancement", "add"],
+    "general": []
+}
+
+# Categories each keyword votes for; keywords shared by categories are checked once
+_KW_TO_CATS: Dict[str, List[str]] = {
+    keyword: [category for category, words in _MOCK_KEYWORDS.items() if keyword in words]
+    for words in _MOCK_KEYWORDS.values()
+    for keyword in words
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _ensure_torch() -> bool:
+    """Import numpy, torch and transformers into this module once; return whether they are available"""
+    global np, torch, AutoTokenizer, AutoModelForSequenceClassification
+    try:
+        import numpy as np
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    except ImportError:
+        return False
+    return True
+
+
+class _EarlyExit(Exception):
+    """Raised from an encoder-layer hook to stop the forward pass early"""
+    
+    def __init__(self, logits):
+        super().__init__()
+        self.logits = logits
+
+
+class TicketTooLong(ValueError):
+    """Raised by classifier_text when STRICT_TEXT_LENGTH rejects a ticket"""
+
+
+def classifier_text(text: str) -> str:
+    """
+    Return the part of a ticket text the classifier sees
+    
+    Raises:
+        TicketTooLong: If the text is too long and STRICT_TEXT_LENGTH is set
+    """
+    # The tokenizer keeps at most 512 tokens anyway, so text past
+    # CLASSIFIER_MAX_CHARS is dropped before it is tokenized
+    if len(text) > settings.CLASSIFIER_MAX_CHARS:
+        if settings.STRICT_TEXT_LENGTH:
+            raise TicketTooLong(f"Ticket text exceeds {settings.CLASSIFIER_MAX_CHARS} characters")
+        text = text[:settings.CLASSIFIER_MAX_CHARS]
+    return text
 
 
 class TicketClassifier:
     """BERT-based ticket classifier"""
     
     # Predefined categories for support tickets
-    CATEGORIES = [
+    CATEGORIES = (
         "billing",
         "technical",
         "access",
         "general",
         "bug_report",
         "feature_request"
-    ]
+    )
     
     def __init__(self):
         self.model_name = settings.MODEL_NAME
         self.tokenizer = None
         self.model = None
         self.device = None
-        self.use_mock = not TORCH_AVAILABLE
+        self.use_mock = False
+        self._traced = False
+        self._onnx = False
+        self._cache = LRUCache(maxsize=settings.CLASSIFIER_CACHE_SIZE)
+        # The model is loaded by the first classification, or by load() at startup
+        self._loaded = False
+        self._load_lock = threading.Lock()
+    
+    def load(self):
+        """
+        Import the ML libraries and load the model, if not done yet
         
-        if TORCH_AVAILABLE:
-            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-            self._load_model()
-        else:
-            logger.warning("PyTorch not available. Using mock classification mode.")
-            self.model_name = "mock-classifier"
+        Blocking and thread-safe; call it from a worker thread to warm up
+        the classifier before the first request.
+        """
+        if self._loaded:
+            return
+        
+        with self._load_lock:
+            if self._loaded:
+                return
+            
+            if _ensure_torch():
+                self._configure_threads()
+                self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+                self._load_model()
+            else:
+                logger.warning("PyTorch not available. Using mock classification mode.")
+                self.use_mock = True
+                self.model_name = "mock-classifier"
+            self._loaded = True
+    
+    def _configure_threads(self):
+        """
+        Pin torch's CPU thread pools
+        
+        Requests already run in parallel on the EXECUTOR threads (and across
+        uvicorn workers), so extra intra-op threads per call only oversubscribe
+        the cores.
+        """
+        torch.set_num_threads(settings.TORCH_NUM_THREADS)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Only allowed before the first parallel op; already fixed otherwise
+            pass
     
     def _load_model(self):
         """Load the transformer model and tokenizer"""
-        if not TORCH_AVAILABLE:
-            return
-            
         try:
-            logger.info(f"Loading model: {self.model_name}")
+            logger.info("Loading model: %s", self.model_name)
             self.tokenizer = AutoTokenizer.from_pretrained(
                 self.model_name,
-                cache_dir=settings.MODEL_CACHE_DIR
+                cache_dir=settings.MODEL_CACHE_DIR,
+                use_fast=True
             )
             
-            # For classification, we'll use a simple approach with a base model
-            # In production, you'd fine-tune this on your ticket data
-            self.model = AutoModelForSequenceClassification.from_pretrained(
-                self.model_name,
-                num_labels=len(self.CATEGORIES),
-                cache_dir=settings.MODEL_CACHE_DIR
-            )
-            self.model.to(self.device)
-            self.model.eval()
+            if settings.INFERENCE_BACKEND == "onnx":
+                self.model = self._load_onnx_model()
+                self._onnx = True
+                # ONNX Runtime runs on the CPU execution provider
+                self.device = torch.device("cpu")
+            else:
+                # For classification, we'll use a simple approach with a base model
+                # In production, you'd fine-tune this on your ticket data
+                self.model = AutoModelForSequenceClassification.from_pretrained(
+                    self.model_name,
+                    num_labels=len(self.CATEGORIES),
+                    cache_dir=settings.MODEL_CACHE_DIR,
+                    torchscript=settings.JIT_MODE
+                )
+                # Half precision runs on the GPU's tensor cores; the CPU stays FP32
+                self.model.to(self.device, dtype=self._inference_dtype())
+                self.model.eval()
+                # GPU keeps the FP32 weights; int8 kernels only pay off on CPU
+                if self.device.type == "cpu" and settings.QUANTIZE_INT8:
+                    self.model = self._quantize_int8(self.model)
+                # Hooks do not survive tracing, so early exit runs the eager model
+                early_exit = (
+                    bool(settings.EARLY_EXIT_HEADS) and settings.EARLY_EXIT_THRESHOLD > 0
+                    and self._attach_exit_heads(self.model)
+                )
+                if not early_exit and settings.JIT_MODE:
+                    self.model = self._trace_model(self.model)
             logger.info("Model loaded successfully")
         except Exception as e:
-            logger.error(f"Error loading model: {e}")
+            logger.error("Error loading model: %s", e)
             logger.warning("Falling back to mock classification mode")
             self.use_mock = True
     
+    def _inference_dtype(self) -> "torch.dtype":
+        """Resolve INFERENCE_DTYPE for the model's device"""
+        if self.device.type != "cuda":
+            return torch.float32
+        if settings.INFERENCE_DTYPE == "auto":
+            return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        return getattr(torch, settings.INFERENCE_DTYPE)
+    
+    def _quantize_int8(self, model):
+        """
+        Apply dynamic int8 quantization to the model's Linear layers
+        
+        Weights are quantized once here and activations on the fly, so no
+        calibration data is needed.
+        """
+        engines = torch.backends.quantized.supported_engines
+        # fbgemm targets x86 (VNNI on AVX512); qnnpack covers ARM
+        torch.backends.quantized.engine = "fbgemm" if "fbgemm" in engines else "qnnpack"
+        logger.info("Quantizing Linear layers to int8 (%s)", torch.backends.quantized.engine)
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    
+    def _attach_exit_heads(self, model) -> bool:
+        """
+        Attach DeeBERT-style early-exit classifiers to the encoder layers
+        
+        EARLY_EXIT_HEADS is a torch.save'd state_dict of an nn.ModuleList
+        holding one nn.Linear(hidden_size, len(CATEGORIES)) for every encoder
+        layer but the last, trained offline by distillation from the full
+        model. After each layer its head scores the [CLS] state, and once the
+        prediction entropy of every ticket in the batch is below
+        EARLY_EXIT_THRESHOLD the remaining layers are skipped.
+        
+        Returns:
+            True if the heads were attached, False if they could not be loaded
+        """
+        threshold = settings.EARLY_EXIT_THRESHOLD
+        try:
+            layers = next(
+                module for module in model.base_model.modules()
+                if isinstance(module, torch.nn.ModuleList)
+                and len(module) == model.config.num_hidden_layers
+            )
+            heads = torch.nn.ModuleList(
+                torch.nn.Linear(model.config.hidden_size, len(self.CATEGORIES))
+                for _ in range(len(layers) - 1)
+            )
+            heads.load_state_dict(torch.load(settings.EARLY_EXIT_HEADS, map_location="cpu", weights_only=True))
+        except Exception as e:
+            logger.warning("Could not load early-exit heads, running full depth: %s", e)
+            return False
+        heads.to(self.device, dtype=self._inference_dtype()).eval()
+        
+        def make_hook(head):
+            def hook(module, args, output):
+                hidden = output[0] if isinstance(output, tuple) else output
+                logits = head(hidden[:, 0])
+                log_probs = torch.log_softmax(logits.float(), dim=-1)
+                entropy = -(log_probs.exp() * log_probs).sum(dim=-1)
+                if bool((entropy < threshold).all()):
+                    raise _EarlyExit(logits)
+            return hook
+        
+        for layer, head in zip(layers, heads):
+            layer.register_forward_hook(make_hook(head))
+        self._exit_heads = heads
+        logger.info("Early exit enabled after any of %s layers (entropy < %s)", len(heads), threshold)
+        return True
+    
+    def _trace_model(self, model):
+        """
+        Trace and freeze the model into a TorchScript graph
+        
+        The graph is traced on one shape, so it is then checked against the
+        eager model on a padded batch of a different shape, the way length
+        bucketing calls it. Falls back to the eager model if tracing fails or
+        the traced graph errors or disagrees on the probe.
+        """
+        dummy = torch.ones((1, 512), dtype=torch.long, device=self.device)
+        probe_ids = torch.arange(14, device=self.device).reshape(2, 7) % model.config.vocab_size
+        probe_mask = torch.ones_like(probe_ids)
+        probe_mask[1, 4:] = 0
+        try:
+            with torch.no_grad():
+                traced = torch.jit.trace(model, (dummy, dummy), strict=False)
+                traced = torch.jit.freeze(traced)
+                expected = model(probe_ids, probe_mask)[0].float()
+                actual = traced(probe_ids, probe_mask)[0].float()
+            if actual.shape != expected.shape or not torch.allclose(actual, expected, rtol=1e-3, atol=1e-3):
+                raise RuntimeError("traced output differs from the eager model on a [2, 7] batch")
+        except Exception as e:
+            logger.warning("TorchScript tracing failed, using the eager model: %s", e)
+            return model
+        
+        self._traced = True
+        return traced
+    
+    def _load_onnx_model(self):
+        """
+        Load an ONNX Runtime export of the model, int8-quantized if QUANTIZE_INT8
+        
+        The first start exports the model to ONNX (and applies dynamic int8
+        quantization); later starts reuse the files in ONNX_CACHE_DIR.
+        Requires the optional optimum[onnxruntime] dependency.
+        """
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        
+        onnx_dir = Path(settings.ONNX_CACHE_DIR) / self.model_name.replace("/", "--")
+        onnx_file = "model.onnx"
+        quantized_file = "model_quantized.onnx"
+        
+        if not (onnx_dir / onnx_file).exists():
+            logger.info("Exporting %s to ONNX in %s", self.model_name, onnx_dir)
+            # Export from a local copy so the classification head has one output per category
+            torch_model_dir = onnx_dir / "pytorch"
+            AutoModelForSequenceClassification.from_pretrained(
+                self.model_name,
+                num_labels=len(self.CATEGORIES),
+                cache_dir=settings.MODEL_CACHE_DIR
+            ).save_pretrained(torch_model_dir)
+            
+            ORTModelForSequenceClassification.from_pretrained(torch_model_dir, export=True).save_pretrained(onnx_dir)
+        
+        if settings.QUANTIZE_INT8 and not (onnx_dir / quantized_file).exists():
+            logger.info("Quantizing %s to int8", onnx_dir / onnx_file)
+            quantizer = ORTQuantizer.from_pretrained(onnx_dir, file_name=onnx_file)
+            quantizer.quantize(
+                save_dir=onnx_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+        
+        return ORTModelForSequenceClassification.from_pretrained(
+            onnx_dir,
+            file_name=quantized_file if settings.QUANTIZE_INT8 else onnx_file,
+            provider="CPUExecutionProvider"
+        )
+    
     def _classify_mock(self, ticket_text: str) -> Dict[str, any]:
         """Mock classification using keyword matching"""
+        # str.__contains__ is a fast C substring search; one per keyword beats a
+        # single regex scan, which CPython's backtracking engine runs per position
         text_lower = ticket_text.lower()
         
-        # Simple keyword-based classification
-        keywords = {
-            "billing": ["payment", "invoice", "billing", "charge", "refund", "subscription", "price", "cost"],
-            "technical": ["error", "bug", "crash", "not working", "broken", "issue", "problem", "technical"],
-            "access": ["login", "password", "access", "account", "permission", "unauthorized", "locked"],
-            "bug_report": ["bug", "error", "crash", "broken", "defect"],
-            "feature_request": ["feature", "request", "suggestion", "improvement", "enhancement", "add"],
-            "general": []
-        }
-        
-        scores = {}
-        for category in self.CATEGORIES:
-            score = 0.0
-            if category in keywords:
-                for keyword in keywords[category]:
-                    if keyword in text_lower:
-                        score += 0.3
-            scores[category] = min(score, 1.0)
+        # Each keyword adds to its categories once, however often it appears
+        scores = dict.fromkeys(self.CATEGORIES, 0.0)
+        for keyword, categories in _KW_TO_CATS.items():
+            if keyword in text_lower:
+                for category in categories:
+                    scores[category] += 0.3
+        scores = {k: min(v, 1.0) for k, v in scores.items()}
         
         # Normalize scores
         total = sum(scores.values())
@@ -116,71 +362,236 @@ class TicketClassifier:
         """
         Classify a support ticket into categories
         
+        Results are memoized by text, so duplicate tickets skip inference.
+        
         Args:
             ticket_text: The ticket content to classify
             
         Returns:
             Dictionary with category, confidence, and all scores
         """
-        if self.use_mock or not TORCH_AVAILABLE:
-            return self._classify_mock(ticket_text)
+        return self.classify_batch([ticket_text])[0]
+    
+    def get_cached(self, ticket_text: str) -> Optional[Dict[str, any]]:
+        """Return the memoized classification for a text, if any"""
+        # A miss here is counted by the classify_batch call that follows it
+        return self._cache.get(text_key(ticket_text), count_miss=False)
+    
+    def cache_stats(self) -> Dict:
+        """Return classification cache statistics"""
+        return self._cache.stats()
+    
+    def _classify_model_batch(self, ticket_texts: List[str], batch_size: int) -> List[Dict[str, any]]:
+        """
+        Classify tickets with the model in length-bucketed sub-batches
         
-        try:
-            # Tokenize input
-            inputs = self.tokenizer(
-                ticket_text,
-                truncation=True,
-                padding=True,
-                max_length=512,
-                return_tensors="pt"
-            ).to(self.device)
-            
-            # Get predictions
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits = outputs.logits
-                probabilities = torch.nn.functional.softmax(logits, dim=-1)
-            
-            # Get top category
-            scores = probabilities[0].cpu().numpy()
-            top_idx = scores.argmax()
-            top_category = self.CATEGORIES[top_idx]
-            confidence = float(scores[top_idx])
-            
-            # Create category scores dictionary
-            category_scores = {
-                self.CATEGORIES[i]: float(scores[i])
-                for i in range(len(self.CATEGORIES))
-            }
-            
-            result = {
-                "category": top_category,
-                "confidence": confidence,
-                "scores": category_scores,
-                "model": self.model_name
-            }
-            
-            logger.info(f"Classified ticket as '{top_category}' with confidence {confidence:.2f}")
-            return result
+        The texts are tokenized once without padding and sorted by token
+        count, so each sub-batch of up to batch_size tickets is padded only to
+        its own longest ticket instead of the longest one overall.
+        """
+        encodings = self.tokenizer(ticket_texts, truncation=True, max_length=512)
+        lengths = [len(input_ids) for input_ids in encodings["input_ids"]]
+        order = sorted(range(len(ticket_texts)), key=lengths.__getitem__)
+        
+        results = [None] * len(ticket_texts)
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            features = {name: [values[i] for i in bucket] for name, values in encodings.items()}
+            if self._onnx:
+                # ONNX Runtime takes and returns numpy arrays, skipping torch tensors entirely
+                inputs = self.tokenizer.pad(features, padding="longest", return_tensors="np")
+                logits = self.model(**inputs).logits
+                exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+                probabilities = exp / exp.sum(axis=-1, keepdims=True)
+                top_indices = probabilities.argmax(axis=-1).tolist()
+            else:
+                inputs = self.tokenizer.pad(features, padding="longest", return_tensors="pt").to(self.device)
+                with torch.inference_mode():
+                    # Softmax in FP32 even when the model runs in half precision
+                    probabilities = torch.nn.functional.softmax(self._forward(inputs).float(), dim=-1)
+                # Copy the sub-batch to the host once and pick the winners there
+                probabilities = probabilities.cpu()
+                top_indices = probabilities.argmax(dim=-1).tolist()
             
-        except Exception as e:
-            logger.error(f"Error classifying ticket: {e}")
-            # Fallback to mock classification
-            return self._classify_mock(ticket_text)
+            for i, scores, top_idx in zip(bucket, probabilities.tolist(), top_indices):
+                results[i] = self._build_result(scores, top_idx)
+        
+        logger.info("Classified batch of %s tickets", len(results))
+        return results
+    
+    def _forward(self, inputs) -> "torch.Tensor":
+        """Run the model on tokenized inputs and return the logits"""
+        if self._traced:
+            # The traced graph takes (input_ids, attention_mask) positionally
+            return self.model(inputs["input_ids"], inputs["attention_mask"])[0]
+        try:
+            return self.model(**inputs)[0]
+        except _EarlyExit as early_exit:
+            return early_exit.logits
+    
+    def _build_result(self, scores: List[float], top_idx: int) -> Dict[str, any]:
+        """Turn one row of class probabilities into a classification result"""
+        return {
+            "category": self.CATEGORIES[top_idx],
+            "confidence": scores[top_idx],
+            "scores": dict(zip(self.CATEGORIES, scores)),
+            "model": self.model_name
+        }
     
-    def classify_batch(self, ticket_texts: List[str]) -> List[Dict[str, any]]:
-        """Classify multiple tickets at once"""
-        return [self.classify(text) for text in ticket_texts]
+    def classify_batch(self, ticket_texts: List[str], batch_size: Optional[int] = None) -> List[Dict[str, any]]:
+        """
+        Classify multiple tickets at once
+        
+        Cached texts are answered from the cache; the remaining unique texts
+        are tokenized together and run through the model in sub-batches of
+        up to batch_size tickets of similar length.
+        
+        Args:
+            ticket_texts: The ticket contents to classify
+            batch_size: Maximum tickets per forward pass (defaults to INFER_BATCH_SIZE)
+            
+        Returns:
+            List of classification dictionaries, in input order
+        """
+        results = [None] * len(ticket_texts)
+        pending: Dict[bytes, List[int]] = {}
+        for i, ticket_text in enumerate(ticket_texts):
+            key = text_key(ticket_text)
+            cached = self._cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.setdefault(key, []).append(i)
+        
+        if not pending:
+            return results
+        
+        self.load()
+        texts = [ticket_texts[positions[0]] for positions in pending.values()]
+        if self.use_mock:
+            computed = [self._classify_mock(text) for text in texts]
+        else:
+            try:
+                computed = self._classify_model_batch(texts, batch_size or settings.INFER_BATCH_SIZE)
+            except Exception as e:
+                logger.error("Error classifying ticket batch: %s", e)
+                # Fallback to mock classification; not cached so the model gets another try
+                for positions, text in zip(pending.values(), texts):
+                    result = self._classify_mock(text)
+                    for i in positions:
+                        results[i] = result
+                return results
+        
+        for (key, positions), result in zip(pending.items(), computed):
+            self._cache.put(key, result)
+            for i in positions:
+                results[i] = result
+        return results
 
 
 # Global classifier instance
-_classifier_instance = None
-
-
+@functools.lru_cache(maxsize=1)
 def get_classifier() -> TicketClassifier:
     """Get or create the global classifier instance"""
-    global _classifier_instance
-    if _classifier_instance is None:
-        _classifier_instance = TicketClassifier()
-    return _classifier_instance
+    return TicketClassifier()
+
+
+class BatchScheduler:
+    """Coalesces concurrent classification requests into micro-batches"""
+    
+    def __init__(self, max_batch_size: int = 32, max_latency_ms: float = 10.0):
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight = set()
+    
+    def start(self):
+        """Start the batching loop on the running event loop (no-op if already running)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+        
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._task = loop.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the batching loop"""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+    
+    async def submit(self, ticket_text: str) -> Dict[str, any]:
+        """
+        Queue a ticket for classification and wait for its result
+        
+        Args:
+            ticket_text: The ticket content to classify
+            
+        Returns:
+            Dictionary with category, confidence, and all scores
+        """
+        # Duplicates are answered from the classifier cache without queueing
+        cached = get_classifier().get_cached(ticket_text)
+        if cached is not None:
+            return cached
+        
+        self.start()
+        future = self._loop.create_future()
+        self._queue.put_nowait((ticket_text, future))
+        return await future
+    
+    async def _run(self):
+        """Collect queued tickets until the batch is full or the latency budget runs out"""
+        loop = asyncio.get_running_loop()
+        while True:
+            ticket_text, future = await self._queue.get()
+            texts, futures = [ticket_text], [future]
+            deadline = loop.time() + self.max_latency
+            
+            while len(texts) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    ticket_text, future = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                texts.append(ticket_text)
+                futures.append(future)
+            
+            # Dispatch without waiting so the next batch can fill while this one runs
+            task = loop.create_task(self._dispatch(texts, futures))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _dispatch(self, texts: List[str], futures: List[asyncio.Future]):
+        """Run one batch on the inference pool and hand each caller its result"""
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(EXECUTOR, get_classifier().classify_batch, texts)
+        except Exception as e:
+            logger.error("Error classifying batch of %s tickets: %s", len(texts), e)
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for future, result in zip(futures, results):
+            # Callers that went away leave a cancelled future behind
+            if not future.done():
+                future.set_result(result)
+
 
+# Global scheduler instance
+@functools.lru_cache(maxsize=1)
+def get_scheduler() -> BatchScheduler:
+    """Get or create the global micro-batch scheduler"""
+    return BatchScheduler(
+        max_batch_size=settings.MICROBATCH_MAX_SIZE,
+        max_latency_ms=settings.MICROBATCH_MAX_LATENCY_MS
+    )
@@ -1,13 +1,43 @@
 """Slack Web API service for sending notifications"""
 
-from typing import Dict, Optional
-import logging
-import requests
+from typing import Dict, List, Optional
+import asyncio
+import functools
+import orjson
 
 from app.utils.config import settings
+from app.utils.http import get_http_client
 from app.utils.logger import logger
 
-logger = logging.getLogger(__name__)
+
+# Slack warns about JSON bodies sent without an explicit charset
+_JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+
+def _build_template(category: str) -> Dict:
+    """Precompute the parts of a ticket notification that depend only on its category"""
+    routing = settings.CATEGORY_ROUTING.get(category)
+    return {
+        "channel": routing.slack_channel if routing and routing.slack_channel else settings.SLACK_CHANNEL_ID,
+        "text_prefix": f"New {category} ticket: ",
+        # Shared, read-only blocks; every notification for the category reuses them
+        "header": {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": f"New {category.title()} Ticket"
+            }
+        },
+        "category_field": {
+            "type": "mrkdwn",
+            "text": f"*Category:*\n{category}"
+        }
+    }
+
+
+# Notification templates for the routed categories, built once at import
+_CATEGORY_TEMPLATES = {category: _build_template(category) for category in settings.CATEGORY_ROUTING}
+_JIRA_BROWSE_URL = f"{settings.JIRA_URL}/browse/"
 
 
 class SlackService:
@@ -17,13 +47,16 @@ class SlackService:
         self.bot_token = settings.SLACK_BOT_TOKEN
         self.base_url = "https://slack.com/api"
         self.default_channel = settings.SLACK_CHANNEL_ID
+        self._headers: Dict[str, str] = {}
         
         if self.bot_token:
+            # The token travels per request; the connection pool is shared process-wide
+            self._headers = {"Authorization": f"Bearer {self.bot_token}", **_JSON_HEADERS}
             logger.info("Slack service initialized with token")
         else:
             logger.warning("Slack token not configured. Using mock mode.")
     
-    def send_message(
+    async def send_message(
         self,
         text: str,
         channel: Optional[str] = None,
@@ -47,12 +80,6 @@ class SlackService:
             return self._send_mock_message(text, channel)
         
         try:
-            url = f"{self.base_url}/chat.postMessage"
-            headers = {
-                "Authorization": f"Bearer {self.bot_token}",
-                "Content-Type": "application/json"
-            }
-            
             payload = {
                 "channel": channel or self.default_channel,
                 "text": text
@@ -64,11 +91,15 @@ class SlackService:
             if thread_ts:
                 payload["thread_ts"] = thread_ts
             
-            response = requests.post(url, json=payload, headers=headers)
+            response = await get_http_client().post(
+                f"{self.base_url}/chat.postMessage",
+                content=orjson.dumps(payload),
+                headers=self._headers
+            )
             result = response.json()
             
             if result.get("ok"):
-                logger.info(f"Sent Slack message to {channel or self.default_channel}")
+                logger.info("Sent Slack message to %s", channel or self.default_channel)
                 return {
                     "success": True,
                     "channel": result.get("channel"),
@@ -77,20 +108,48 @@ class SlackService:
                 }
             else:
                 error_msg = result.get("error", "Unknown error")
-                logger.error(f"Failed to send Slack message: {error_msg}")
+                logger.error("Failed to send Slack message: %s", error_msg)
                 return {
                     "success": False,
                     "error": error_msg
                 }
                 
         except Exception as e:
-            logger.error(f"Error sending Slack message: {e}")
+            logger.error("Error sending Slack message: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    def send_ticket_notification(
+    async def send_messages_batch(self, payloads: List[Dict]) -> List[Dict]:
+        """
+        Send several messages concurrently over the pooled connection
+        
+        Args:
+            payloads: Keyword arguments for send_message, one dict per message
+            
+        Returns:
+            List of message statuses, in payload order
+        """
+        return await asyncio.gather(*(self.send_message(**payload) for payload in payloads))
+    
+    async def warmup(self) -> bool:
+        """Open the pooled connection to Slack before the first notification"""
+        if not self.bot_token:
+            return True
+        
+        try:
+            response = await get_http_client().post(f"{self.base_url}/auth.test", headers=self._headers)
+            result = response.json()
+            if not result.get("ok"):
+                logger.warning("Slack warmup failed: %s", result.get('error', 'Unknown error'))
+                return False
+            return True
+        except Exception as e:
+            logger.warning("Slack warmup failed: %s", e)
+            return False
+    
+    async def send_ticket_notification(
         self,
         ticket_id: str,
         category: str,
@@ -111,19 +170,11 @@ class SlackService:
         Returns:
             Dictionary with notification status
         """
-        # Determine channel based on category
-        routing = settings.CATEGORY_ROUTING.get(category, {})
-        target_channel = channel or routing.get("slack_channel", self.default_channel)
+        template = _CATEGORY_TEMPLATES.get(category) or _build_template(category)
         
-        # Create rich message blocks
+        # Only the per-ticket blocks are built here; the rest comes from the template
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"New {category.title()} Ticket"
-                }
-            },
+            template["header"],
             {
                 "type": "section",
                 "fields": [
@@ -131,10 +182,7 @@ class SlackService:
                         "type": "mrkdwn",
                         "text": f"*Ticket ID:*\n{ticket_id}"
                     },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Category:*\n{category}"
-                    }
+                    template["category_field"]
                 ]
             },
             {
@@ -146,20 +194,18 @@ class SlackService:
             }
         ]
         
+        text = template["text_prefix"] + summary
         if jira_key:
             blocks.append({
                 "type": "section",
                 "text": {
                     "type": "mrkdwn",
-                    "text": f"*Jira Issue:* <{settings.JIRA_URL}/browse/{jira_key}|{jira_key}>"
+                    "text": f"*Jira Issue:* <{_JIRA_BROWSE_URL}{jira_key}|{jira_key}>"
                 }
             })
-        
-        text = f"New {category} ticket: {summary}"
-        if jira_key:
             text += f" (Jira: {jira_key})"
         
-        return self.send_message(text, channel=target_channel, blocks=blocks)
+        return await self.send_message(text, channel=channel or template["channel"], blocks=blocks)
     
     def _send_mock_message(self, text: str, channel: Optional[str]) -> Dict:
         """Send a mock message for testing"""
@@ -173,13 +219,8 @@ class SlackService:
 
 
 # Global service instance
-_slack_service_instance = None
-
-
+@functools.lru_cache(maxsize=1)
 def get_slack_service() -> SlackService:
     """Get or create the global Slack service instance"""
-    global _slack_service_instance
-    if _slack_service_instance is None:
-        _slack_service_instance = SlackService()
-    return _slack_service_instance
+    return SlackService()
 
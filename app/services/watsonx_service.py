@@ -1,12 +1,33 @@
 """IBM watsonx.ai service for LLM inference and response generation"""
 
-from typing import Dict, Optional
-import logging
+from typing import Dict, Iterator, Optional
+import asyncio
+import functools
+import threading
 
+from app.utils.cache import LRUCache, text_key
 from app.utils.config import settings
 from app.utils.logger import logger
 
-logger = logging.getLogger(__name__)
+
+def _suggest_prompt(ticket_text: str, category: str) -> str:
+    """Build the prompt asking for a reply to a ticket"""
+    return f"""You are a helpful support agent. Generate a professional and empathetic response to this {category} support ticket.
+
+Ticket:
+{ticket_text}
+
+Response:"""
+
+
+def _summary_prompt(ticket_text: str) -> str:
+    """Build the prompt asking for a ticket summary"""
+    return f"""Summarize this support ticket in 2-3 sentences, highlighting the key issue and urgency.
+
+Ticket:
+{ticket_text}
+
+Summary:"""
 
 
 class WatsonXService:
@@ -17,8 +38,31 @@ class WatsonXService:
         self.url = settings.WATSONX_URL
         self.project_id = settings.WATSONX_PROJECT_ID
         self.model_id = settings.WATSONX_MODEL_ID
+        self._cache = LRUCache(maxsize=settings.WATSONX_CACHE_SIZE)
         
+        # The SDK is imported and the model created on first use, or by load() at startup
         self.available = False
+        self._loaded = False
+        self._load_lock = threading.Lock()
+    
+    def load(self):
+        """
+        Import the watsonx SDK and create the model client, if not done yet
+        
+        Blocking and thread-safe; call it from a worker thread to warm up
+        the service before the first request.
+        """
+        if self._loaded:
+            return
+        
+        with self._load_lock:
+            if self._loaded:
+                return
+            self._load_model()
+            self._loaded = True
+    
+    def _load_model(self):
+        """Import the watsonx SDK and initialize the model"""
         if self.api_key and self.project_id:
             try:
                 # Import watsonx SDK
@@ -37,15 +81,16 @@ class WatsonXService:
                     "apikey": self.api_key
                 }
                 
+                self.params = {
+                    GenParams.DECODING_METHOD: DecodingMethods.GREEDY,
+                    GenParams.MAX_NEW_TOKENS: 200,
+                    GenParams.TEMPERATURE: 0.7
+                }
                 self.model = Model(
                     model_id=self.model_id,
                     credentials=credentials,
                     project_id=self.project_id,
-                    params={
-                        GenParams.DECODING_METHOD: DecodingMethods.GREEDY,
-                        GenParams.MAX_NEW_TOKENS: 200,
-                        GenParams.TEMPERATURE: 0.7
-                    }
+                    params=self.params
                 )
                 
                 logger.info("watsonx.ai service initialized successfully")
@@ -54,7 +99,7 @@ class WatsonXService:
                 logger.warning("watsonx SDK not installed. Install with: pip install ibm-watson-machine-learning")
                 self.available = False
             except Exception as e:
-                logger.error(f"Error initializing watsonx service: {e}")
+                logger.error("Error initializing watsonx service: %s", e)
                 self.available = False
         else:
             logger.warning("watsonx.ai credentials not configured. Using mock mode.")
@@ -64,6 +109,9 @@ class WatsonXService:
         """
         Generate a response using watsonx.ai
         
+        Successful generations are memoized by (prompt, max_tokens), so a
+        repeated prompt skips the API round-trip.
+        
         Args:
             prompt: The input prompt
             max_tokens: Maximum tokens to generate
@@ -71,28 +119,84 @@ class WatsonXService:
         Returns:
             Dictionary with generated text
         """
+        self.load()
         if not self.available:
             logger.warning("watsonx not available, returning mock response")
             return self._generate_mock_response(prompt)
         
+        key = (text_key(prompt), max_tokens)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
             response = self.model.generate(prompt, max_new_tokens=max_tokens)
             generated_text = response.get('results', [{}])[0].get('generated_text', '')
             
             logger.info("Generated response from watsonx.ai")
-            return {
+            result = {
                 "success": True,
                 "text": generated_text,
                 "model": self.model_id
             }
+            self._cache.put(key, result)
+            return result
         except Exception as e:
-            logger.error(f"Error generating response with watsonx: {e}")
+            logger.error("Error generating response with watsonx: %s", e)
             return {
                 "success": False,
                 "error": str(e),
                 "text": self._generate_mock_response(prompt)["text"]
             }
     
+    async def agenerate_response(self, prompt: str, max_tokens: int = 200) -> Dict:
+        """
+        Generate a response using watsonx.ai without blocking the event loop
+        
+        Runs generate_response on a worker thread; see it for details.
+        """
+        return await asyncio.to_thread(self.generate_response, prompt, max_tokens)
+    
+    def stream_response(self, prompt: str, max_tokens: int = 200) -> Iterator[str]:
+        """
+        Generate a response using watsonx.ai, yielding text chunks as they arrive
+        
+        This is a blocking generator; iterate it from a worker thread. A
+        cached or mock response is yielded as a single chunk, and a completed
+        stream is cached like generate_response.
+        
+        Args:
+            prompt: The input prompt
+            max_tokens: Maximum tokens to generate
+            
+        Yields:
+            Generated text chunks
+        """
+        self.load()
+        if not self.available:
+            logger.warning("watsonx not available, returning mock response")
+            yield self._generate_mock_response(prompt)["text"]
+            return
+        
+        key = (text_key(prompt), max_tokens)
+        cached = self._cache.get(key)
+        if cached is not None:
+            yield cached["text"]
+            return
+        
+        chunks = []
+        params = {**self.params, self.gen_params.MAX_NEW_TOKENS: max_tokens}
+        for chunk in self.model.generate_text_stream(prompt, params=params):
+            chunks.append(chunk)
+            yield chunk
+        
+        logger.info("Streamed response from watsonx.ai")
+        self._cache.put(key, {
+            "success": True,
+            "text": "".join(chunks),
+            "model": self.model_id
+        })
+    
     def suggest_reply(self, ticket_text: str, category: str) -> Dict:
         """
         Generate a suggested reply for a support ticket
@@ -104,14 +208,15 @@ class WatsonXService:
         Returns:
             Dictionary with suggested reply
         """
-        prompt = f"""You are a helpful support agent. Generate a professional and empathetic response to this {category} support ticket.
-
-Ticket:
-{ticket_text}
-
-Response:"""
-        
-        return self.generate_response(prompt, max_tokens=300)
+        return self.generate_response(_suggest_prompt(ticket_text, category), max_tokens=300)
+    
+    async def asuggest_reply(self, ticket_text: str, category: str) -> Dict:
+        """Async version of suggest_reply"""
+        return await self.agenerate_response(_suggest_prompt(ticket_text, category), max_tokens=300)
+    
+    def stream_suggest_reply(self, ticket_text: str, category: str) -> Iterator[str]:
+        """Streaming version of suggest_reply; yields reply text chunks"""
+        return self.stream_response(_suggest_prompt(ticket_text, category), max_tokens=300)
     
     def summarize_ticket(self, ticket_text: str) -> Dict:
         """
@@ -123,14 +228,11 @@ Response:"""
         Returns:
             Dictionary with ticket summary
         """
-        prompt = f"""Summarize this support ticket in 2-3 sentences, highlighting the key issue and urgency.
-
-Ticket:
-{ticket_text}
-
-Summary:"""
-        
-        return self.generate_response(prompt, max_tokens=150)
+        return self.generate_response(_summary_prompt(ticket_text), max_tokens=150)
+    
+    async def asummarize_ticket(self, ticket_text: str) -> Dict:
+        """Async version of summarize_ticket"""
+        return await self.agenerate_response(_summary_prompt(ticket_text), max_tokens=150)
     
     def _generate_mock_response(self, prompt: str) -> Dict:
         """Generate a mock response for testing"""
@@ -151,13 +253,8 @@ Summary:"""
 
 
 # Global service instance
-_watsonx_service_instance = None
-
-
+@functools.lru_cache(maxsize=1)
 def get_watsonx_service() -> WatsonXService:
     """Get or create the global watsonx service instance"""
-    global _watsonx_service_instance
-    if _watsonx_service_instance is None:
-        _watsonx_service_instance = WatsonXService()
-    return _watsonx_service_instance
+    return WatsonXService()
 
@@ -95,3 +95,119 @@ def test_root_endpoint():
     assert "version" in data
     assert "status" in data
 
+
+def test_batch_scheduler_coalesces_concurrent_requests(monkeypatch):
+    """Test that concurrent submissions share a single classifier batch"""
+    import asyncio
+    from app.services.model_service import BatchScheduler, get_classifier
+    
+    classifier = get_classifier()
+    batch_sizes = []
+    original_classify_batch = classifier.classify_batch
+    
+    def recording_classify_batch(ticket_texts):
+        batch_sizes.append(len(ticket_texts))
+        return original_classify_batch(ticket_texts)
+    
+    monkeypatch.setattr(classifier, "classify_batch", recording_classify_batch)
+    
+    async def submit_all():
+        scheduler = BatchScheduler(max_batch_size=8, max_latency_ms=50)
+        try:
+            return await asyncio.gather(*(scheduler.submit(f"Ticket {i}") for i in range(5)))
+        finally:
+            await scheduler.stop()
+    
+    results = asyncio.run(submit_all())
+    assert len(results) == 5
+    assert all("category" in result for result in results)
+    assert batch_sizes == [5]
+
+
+def test_duplicate_ticket_hits_cache():
+    """Test that classifying the same text twice is served from the cache"""
+    text = "Duplicate ticket: please refund my last invoice."
+    before = client.get("/cache/stats").json()
+    
+    first = client.post("/classify", json={"text": text})
+    second = client.post("/classify", json={"text": text})
+    
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    after = client.get("/cache/stats").json()
+    assert after["hits"] > before["hits"]
+    assert 0 <= after["hit_rate"] <= 1
+
+
+def test_classify_rejects_oversized_text():
+    """Test that tickets above the hard size cap fail validation"""
+    from app.utils.config import settings
+    
+    response = client.post("/classify", json={"text": "a" * (settings.MAX_TICKET_CHARS + 1)})
+    assert response.status_code == 422
+
+
+def test_classify_strict_length_returns_413(monkeypatch):
+    """Test that strict mode rejects text the classifier would otherwise truncate"""
+    from app.services import model_service
+    from app.utils.config import settings
+    
+    long_text = "refund " * settings.CLASSIFIER_MAX_CHARS
+    long_text = long_text[:settings.MAX_TICKET_CHARS]
+    
+    assert client.post("/classify", json={"text": long_text}).status_code == 200
+    
+    # Settings are frozen; swap in a modified copy for the shared length check
+    monkeypatch.setattr(model_service, "settings", settings.model_copy(update={"STRICT_TEXT_LENGTH": True}))
+    assert client.post("/classify", json={"text": long_text}).status_code == 413
+    assert client.post("/route", json={"ticket_id": "T-413", "text": long_text}).status_code == 413
+
+
+def test_classify_stream_suggestion():
+    """Test streaming a suggested reply as Server-Sent Events"""
+    response = client.post("/classify/stream", json={"text": "I was charged twice, please refund"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    
+    events = [
+        dict(line.split(": ", 1) for line in block.splitlines())
+        for block in response.text.strip().split("\n\n")
+    ]
+    assert events[0]["event"] == "classification"
+    assert "category" in events[0]["data"]
+    assert all(event["event"] == "suggestion" for event in events[1:-1])
+    assert len(events) > 2
+    assert events[-1]["event"] == "done"
+
+
+def test_classify_stream_reports_generation_error(monkeypatch):
+    """Test that a failure mid-generation ends the stream with an error event"""
+    from app.services.watsonx_service import get_watsonx_service
+    
+    def failing_stream(ticket_text, category):
+        yield "Thank you"
+        raise RuntimeError("watsonx unavailable")
+    
+    monkeypatch.setattr(get_watsonx_service(), "stream_suggest_reply", failing_stream)
+    response = client.post("/classify/stream", json={"text": "I was charged twice, please refund"})
+    assert response.status_code == 200
+    
+    events = [
+        dict(line.split(": ", 1) for line in block.splitlines())
+        for block in response.text.strip().split("\n\n")
+    ]
+    assert [event["event"] for event in events] == ["classification", "suggestion", "error"]
+    assert "watsonx unavailable" in events[-1]["data"]
+
+
+def test_classify_stream_classification_error_returns_500(monkeypatch):
+    """Test that a classifier failure before streaming is reported as a 500"""
+    from app.services.model_service import get_scheduler
+    
+    async def failing_submit(text):
+        raise RuntimeError("classifier down")
+    
+    monkeypatch.setattr(get_scheduler(), "submit", failing_submit)
+    response = client.post("/classify/stream", json={"text": "I was charged twice, please refund"})
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Classification error: classifier down"
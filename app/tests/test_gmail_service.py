@@ -0,0 +1,135 @@
+"""Tests for Gmail ticket ingestion"""
+
+import base64
+
+import pytest
+
+from app.services.gmail_service import GmailService
+
+
+class FakeRequest:
+    """Stand-in for a googleapiclient HttpRequest"""
+    
+    def __init__(self, result):
+        self.result = result
+    
+    def execute(self):
+        return self.result
+
+
+class FakeBatch:
+    """Stand-in for a googleapiclient BatchHttpRequest"""
+    
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+    
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+    
+    def execute(self):
+        for request_id, request in self.requests:
+            self.callback(request_id, request.execute(), None)
+
+
+class FakeGmail:
+    """Minimal Gmail API resource serving canned messages"""
+    
+    def __init__(self, messages):
+        self.messages_by_id = {message["id"]: message for message in messages}
+        self.batches = []
+    
+    def users(self):
+        return self
+    
+    def messages(self):
+        return self
+    
+    def list(self, **kwargs):
+        return FakeRequest({"messages": [{"id": message_id} for message_id in self.messages_by_id]})
+    
+    def get(self, userId, id, format, **kwargs):
+        return FakeRequest(self.messages_by_id[id])
+    
+    def new_batch_http_request(self, callback):
+        batch = FakeBatch(callback)
+        self.batches.append(batch)
+        return batch
+
+
+def make_message(message_id: str, subject: str, body: str) -> dict:
+    """Build a single-part Gmail message resource"""
+    return {
+        "id": message_id,
+        "payload": {
+            "mimeType": "text/plain",
+            "headers": [
+                {"name": "Subject", "value": subject},
+                {"name": "From", "value": "customer@example.com"},
+                {"name": "Date", "value": "Mon, 1 Jan 2024 10:00:00 +0000"},
+            ],
+            "body": {"data": base64.urlsafe_b64encode(body.encode()).decode()},
+        },
+    }
+
+
+@pytest.fixture
+def gmail_service():
+    """Gmail service in mock mode, ready to have a fake API attached"""
+    return GmailService()
+
+
+def test_fetch_tickets_uses_batch_requests(gmail_service):
+    """Test that messages are fetched in batches of at most 100 and keep search order"""
+    messages = [make_message(f"msg-{i}", f"Subject {i}", f"Body {i}") for i in range(150)]
+    gmail_service.service = FakeGmail(messages)
+    
+    tickets = gmail_service.fetch_tickets(max_results=150)
+    
+    assert [ticket["id"] for ticket in tickets] == [f"msg-{i}" for i in range(150)]
+    assert [len(batch.requests) for batch in gmail_service.service.batches] == [100, 50]
+    assert tickets[7]["subject"] == "Subject 7"
+    assert tickets[7]["body"] == "Body 7"
+    assert tickets[7]["text"] == "Subject 7\n\nBody 7"
+    assert tickets[7]["source"] == "gmail"
+
+
+def test_extract_body_joins_plain_text_parts(gmail_service):
+    """Test that only text/plain parts are decoded and parts without data are skipped"""
+    def encode(text):
+        return base64.urlsafe_b64encode(text.encode()).decode()
+    
+    payload = {
+        "mimeType": "multipart/alternative",
+        "parts": [
+            {"mimeType": "text/plain", "body": {"data": encode("Hello ")}},
+            {"mimeType": "text/html", "body": {"data": encode("<p>Hello</p>")}},
+            {"mimeType": "text/plain", "body": {"size": 0}},
+            {"mimeType": "text/plain", "body": {"data": encode("world ✓")}},
+        ],
+    }
+    
+    assert gmail_service._extract_body(payload) == "Hello world ✓"
+    assert gmail_service._extract_body({"mimeType": "text/html", "body": {"data": encode("x")}}) == ""
+
+
+def test_extract_body_accepts_unpadded_base64(gmail_service):
+    """Test that URL-safe base64 without trailing padding still decodes"""
+    data = base64.urlsafe_b64encode("Need help?>>".encode()).decode().rstrip("=")
+    
+    assert gmail_service._extract_body({"mimeType": "text/plain", "body": {"data": data}}) == "Need help?>>"
+
+
+def test_parse_message_matches_headers_case_insensitively(gmail_service):
+    """Test that lower- or upper-case header names are still recognized"""
+    message = make_message("msg-case", "ignored", "Body")
+    message["payload"]["headers"] = [
+        {"name": "subject", "value": "Lowercase subject"},
+        {"name": "FROM", "value": "shouty@example.com"},
+    ]
+    
+    ticket = gmail_service._parse_message(message)
+    
+    assert ticket["subject"] == "Lowercase subject"
+    assert ticket["from"] == "shouty@example.com"
+    assert ticket["date"] == ""
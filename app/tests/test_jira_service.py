@@ -0,0 +1,66 @@
+"""Tests for Jira issue creation"""
+
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from app.services import jira_service
+from app.services.jira_service import JiraService, _adf_document
+from app.utils.config import settings
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    """Configure Jira credentials and capture request bodies instead of sending them"""
+    requests = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(201, json={"id": "10001", "key": "SUP-1"})
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(jira_service, "get_http_client", lambda: client)
+    # Settings are frozen; swap in a copy with credentials and a short description limit
+    monkeypatch.setattr(jira_service, "settings", settings.model_copy(update={
+        "JIRA_EMAIL": "triage@example.com",
+        "JIRA_API_TOKEN": "token",
+        "JIRA_DESC_MAX": 200
+    }))
+    yield requests
+    asyncio.run(client.aclose())
+
+
+def test_create_issue_payload_matches_plain_dict(captured):
+    """Test that the spliced payload skeleton serializes like the plain payload"""
+    service = JiraService()
+    summary = 'Refund "twice"\nfor café order \u2063summary\u2063'
+    description = "Line one\n\tline \"two\" \\ ☃ \u2063description\u2063"
+    
+    result = asyncio.run(service.create_issue(summary, description, priority="High", labels=["billing", "vip"]))
+    assert result["success"] is True
+    assert result["issue_key"] == "SUP-1"
+    
+    assert orjson.loads(captured[0].content) == {
+        "fields": {
+            "project": {"key": service.project_key},
+            "summary": summary,
+            "description": _adf_document(description),
+            "issuetype": {"name": "Task"},
+            "priority": {"name": "High"},
+            "labels": ["billing", "vip"]
+        }
+    }
+
+
+def test_create_issue_truncates_long_description(captured):
+    """Test that long descriptions are cut to JIRA_DESC_MAX with a note"""
+    service = JiraService()
+    
+    asyncio.run(service.create_issue("Long ticket", "x" * 500, ticket_id="T-42"))
+    
+    description = orjson.loads(captured[0].content)["fields"]["description"]["content"][0]["content"][0]["text"]
+    assert len(description) == 200
+    assert description.endswith("\n\n[Truncated, see ticket T-42 for the full text]")
+    assert description.startswith("x" * 100)
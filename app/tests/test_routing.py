@@ -104,3 +104,130 @@ def test_route_minimal_request():
     assert data["ticket_id"] == "MIN-001"
     assert "category" in data
 
+
+def test_route_batch_reports_failed_ticket(monkeypatch):
+    """Test that one failing ticket does not abort the whole batch"""
+    from fastapi import HTTPException
+    from app.routes import route as route_module
+    
+    original_route = route_module._route
+    
+    async def flaky_route(request, classification=None):
+        if request.ticket_id == "BATCH-FAIL":
+            raise HTTPException(status_code=500, detail="Routing error: boom")
+        return await original_route(request, classification)
+    
+    monkeypatch.setattr(route_module, "_route", flaky_route)
+    
+    tickets = [
+        {"ticket_id": ticket_id, "text": "Test ticket", "create_jira": False, "send_slack": False}
+        for ticket_id in ("BATCH-OK", "BATCH-FAIL")
+    ]
+    
+    response = client.post("/route/batch", json=tickets)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["processed"] == 2
+    assert data["results"][0]["ticket_id"] == "BATCH-OK"
+    assert "category" in data["results"][0]
+    assert data["results"][1] == {"ticket_id": "BATCH-FAIL", "error": "Routing error: boom"}
+
+
+def test_route_batch_classifies_in_one_call(monkeypatch):
+    """Test that batch routing classifies all unlabeled tickets together"""
+    from app.services.model_service import get_classifier
+    
+    classifier = get_classifier()
+    original_classify_batch = classifier.classify_batch
+    batch_sizes = []
+    
+    def recording_classify_batch(texts, batch_size=None):
+        batch_sizes.append(len(texts))
+        return original_classify_batch(texts, batch_size)
+    
+    monkeypatch.setattr(classifier, "classify_batch", recording_classify_batch)
+    
+    tickets = [
+        {"ticket_id": f"ONE-CALL-{i}", "text": f"Invoice question {i}", "create_jira": False, "send_slack": False}
+        for i in range(4)
+    ]
+    tickets.append({
+        "ticket_id": "ONE-CALL-PRESET",
+        "text": "Already triaged",
+        "category": "access",
+        "create_jira": False,
+        "send_slack": False
+    })
+    
+    response = client.post("/route/batch", json=tickets)
+    assert response.status_code == 200
+    assert response.json()["processed"] == 5
+    assert batch_sizes == [4]
+
+
+def test_route_preclassified_ticket():
+    """Test that a ticket with a known category is routed without reclassification"""
+    response = client.post(
+        "/route",
+        json={
+            "ticket_id": "PRE-001",
+            "text": "I cannot log into my account.",
+            "category": "billing",
+            "create_jira": False,
+            "send_slack": False
+        }
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["category"] == "billing"
+    assert data["confidence"] == 1.0
+    assert data["routing_config"]["slack_channel"] == "#billing"
+
+
+def test_route_rejects_unknown_category():
+    """Test that an unknown preset category is rejected"""
+    response = client.post(
+        "/route",
+        json={"ticket_id": "PRE-002", "text": "Help needed", "category": "nonsense"}
+    )
+    
+    assert response.status_code == 422
+
+
+def test_route_batch_stream():
+    """Test streaming batch routing as newline-delimited JSON"""
+    import json
+    
+    tickets = [
+        {
+            "ticket_id": f"STREAM-{i}",
+            "text": f"Streamed ticket {i}",
+            "create_jira": False,
+            "send_slack": False
+        }
+        for i in range(3)
+    ]
+    
+    response = client.post("/route/batch/stream", json=tickets)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(result["ticket_id"] for result in results) == ["STREAM-0", "STREAM-1", "STREAM-2"]
+    assert all("category" in result for result in results)
+
+
+def test_route_batch_stream_classification_error_returns_500(monkeypatch):
+    """Test that a classifier failure is reported before the stream starts"""
+    from app.services.model_service import get_classifier
+    
+    def failing_classify_batch(texts, batch_size=None):
+        raise RuntimeError("classifier down")
+    
+    monkeypatch.setattr(get_classifier(), "classify_batch", failing_classify_batch)
+    
+    tickets = [{"ticket_id": "STREAM-FAIL", "text": "Streamed ticket", "create_jira": False, "send_slack": False}]
+    response = client.post("/route/batch/stream", json=tickets)
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Batch routing error: classifier down"
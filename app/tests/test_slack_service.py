@@ -0,0 +1,90 @@
+"""Tests for Slack notifications"""
+
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from app.services import slack_service
+from app.services.slack_service import SlackService
+from app.utils.config import settings
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    """Configure a Slack token and capture requests instead of sending them"""
+    requests = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = orjson.loads(request.content)
+        return httpx.Response(200, json={"ok": True, "channel": body["channel"], "ts": f"{len(requests)}.0"})
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(slack_service, "get_http_client", lambda: client)
+    # Settings are frozen; swap in a copy with a token and a fallback channel
+    monkeypatch.setattr(slack_service, "settings", settings.model_copy(update={
+        "SLACK_BOT_TOKEN": "xoxb-test",
+        "SLACK_CHANNEL_ID": "#triage"
+    }))
+    yield requests
+    asyncio.run(client.aclose())
+
+
+def test_send_ticket_notification_request(captured):
+    """Test the request sent for a routed category with a linked Jira issue"""
+    service = SlackService()
+    
+    result = asyncio.run(service.send_ticket_notification(
+        ticket_id="T-7",
+        category="billing",
+        summary="Charged twice",
+        jira_key="SUP-1"
+    ))
+    assert result["success"] is True
+    assert result["channel"] == "#billing"
+    
+    request = captured[0]
+    assert str(request.url) == "https://slack.com/api/chat.postMessage"
+    assert request.headers["authorization"] == "Bearer xoxb-test"
+    assert request.headers["content-type"] == "application/json; charset=utf-8"
+    
+    body = orjson.loads(request.content)
+    assert body["channel"] == "#billing"
+    assert body["text"] == "New billing ticket: Charged twice (Jira: SUP-1)"
+    assert body["blocks"][0]["text"]["text"] == "New Billing Ticket"
+    assert body["blocks"][1]["fields"] == [
+        {"type": "mrkdwn", "text": "*Ticket ID:*\nT-7"},
+        {"type": "mrkdwn", "text": "*Category:*\nbilling"}
+    ]
+    assert body["blocks"][2]["text"]["text"] == "*Summary:*\nCharged twice"
+    assert body["blocks"][3]["text"]["text"] == f"*Jira Issue:* <{settings.JIRA_URL}/browse/SUP-1|SUP-1>"
+
+
+def test_send_ticket_notification_unrouted_category(captured):
+    """Test that categories without routing go to SLACK_CHANNEL_ID without a Jira block"""
+    service = SlackService()
+    
+    asyncio.run(service.send_ticket_notification(ticket_id="T-8", category="bug_report", summary="Crash on save"))
+    
+    body = orjson.loads(captured[0].content)
+    assert body["channel"] == "#triage"
+    assert body["text"] == "New bug_report ticket: Crash on save"
+    assert len(body["blocks"]) == 3
+
+
+def test_send_messages_batch(captured):
+    """Test that batched messages are all sent and reported in payload order"""
+    service = SlackService()
+    
+    results = asyncio.run(service.send_messages_batch([
+        {"text": "first", "channel": "#one"},
+        {"text": "second", "thread_ts": "1.0"}
+    ]))
+    assert [result["channel"] for result in results] == ["#one", "#triage"]
+    assert all(result["success"] for result in results)
+    
+    bodies = sorted((orjson.loads(request.content) for request in captured), key=lambda body: body["text"])
+    assert bodies[0] == {"channel": "#one", "text": "first"}
+    assert bodies[1] == {"channel": "#triage", "text": "second", "thread_ts": "1.0"}
@@ -0,0 +1,69 @@
+"""Thread-safe LRU cache for memoizing expensive results"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import hashlib
+import threading
+
+
+def text_key(text: str) -> bytes:
+    """Return a stable 128-bit digest of a text for use as a cache key"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit/miss counters"""
+    
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable, count_miss: bool = True) -> Optional[Any]:
+        """
+        Return the cached value for key, or None on a miss
+        
+        Pass count_miss=False for a fast-path probe that is followed by a
+        counted lookup, so one logical miss is not recorded twice.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                if count_miss:
+                    self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict:
+        """Return size and hit-rate statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
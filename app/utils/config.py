@@ -1,53 +1,99 @@
 """Configuration management using environment variables"""
 
+from typing import Literal, Mapping, Optional
+import functools
 import os
-from typing import Optional
-from pydantic import BaseSettings
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class RoutingConfig(BaseModel):
+    """Where tickets of one category are routed"""
+    model_config = ConfigDict(frozen=True)
+    
+    jira_priority: str = "Medium"
+    slack_channel: Optional[str] = None
+
+
+def _default_category_routing() -> Mapping[str, RoutingConfig]:
+    """Default routing for the categories that have a dedicated team"""
+    return {
+        "billing": RoutingConfig(jira_priority="High", slack_channel="#billing"),
+        "technical": RoutingConfig(jira_priority="Medium", slack_channel="#technical"),
+        "access": RoutingConfig(jira_priority="High", slack_channel="#access"),
+        "general": RoutingConfig(jira_priority="Low", slack_channel="#general"),
+    }
 
 
 class Settings(BaseSettings):
-    """Application settings loaded from environment variables"""
+    """Application settings loaded from environment variables and .env"""
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        extra="ignore",
+        frozen=True
+    )
     
     # API Keys and Tokens
-    GMAIL_CLIENT_ID: Optional[str] = os.getenv("GMAIL_CLIENT_ID")
-    GMAIL_CLIENT_SECRET: Optional[str] = os.getenv("GMAIL_CLIENT_SECRET")
-    GMAIL_REFRESH_TOKEN: Optional[str] = os.getenv("GMAIL_REFRESH_TOKEN")
+    GMAIL_CLIENT_ID: Optional[str] = None
+    GMAIL_CLIENT_SECRET: Optional[str] = None
+    GMAIL_REFRESH_TOKEN: Optional[str] = None
     
-    JIRA_URL: Optional[str] = os.getenv("JIRA_URL", "https://your-domain.atlassian.net")
-    JIRA_EMAIL: Optional[str] = os.getenv("JIRA_EMAIL")
-    JIRA_API_TOKEN: Optional[str] = os.getenv("JIRA_API_TOKEN")
-    JIRA_PROJECT_KEY: Optional[str] = os.getenv("JIRA_PROJECT_KEY", "SUP")
+    JIRA_URL: Optional[str] = "https://your-domain.atlassian.net"
+    JIRA_EMAIL: Optional[str] = None
+    JIRA_API_TOKEN: Optional[str] = None
+    JIRA_PROJECT_KEY: Optional[str] = "SUP"
     
-    SLACK_BOT_TOKEN: Optional[str] = os.getenv("SLACK_BOT_TOKEN")
-    SLACK_CHANNEL_ID: Optional[str] = os.getenv("SLACK_CHANNEL_ID", "#support-tickets")
+    SLACK_BOT_TOKEN: Optional[str] = None
+    SLACK_CHANNEL_ID: Optional[str] = "#support-tickets"
     
     # IBM watsonx.ai
-    WATSONX_API_KEY: Optional[str] = os.getenv("WATSONX_API_KEY")
-    WATSONX_URL: Optional[str] = os.getenv("WATSONX_URL", "https://us-south.ml.cloud.ibm.com")
-    WATSONX_PROJECT_ID: Optional[str] = os.getenv("WATSONX_PROJECT_ID")
-    WATSONX_MODEL_ID: Optional[str] = os.getenv("WATSONX_MODEL_ID", "meta-llama/llama-3-8b-instruct")
+    WATSONX_API_KEY: Optional[str] = None
+    WATSONX_URL: Optional[str] = "https://us-south.ml.cloud.ibm.com"
+    WATSONX_PROJECT_ID: Optional[str] = None
+    WATSONX_MODEL_ID: Optional[str] = "meta-llama/llama-3-8b-instruct"
     
     # Model Configuration
-    MODEL_NAME: str = os.getenv("MODEL_NAME", "bert-base-uncased")
-    MODEL_CACHE_DIR: str = os.getenv("MODEL_CACHE_DIR", "./models")
+    MODEL_NAME: str = "distilbert-base-uncased"
+    MODEL_CACHE_DIR: str = "./models"
+    INFERENCE_BACKEND: str = "torch"  # "torch" or "onnx"
+    ONNX_CACHE_DIR: str = "./.cache/onnx-int8"
+    INFERENCE_DTYPE: Literal["auto", "float32", "float16", "bfloat16"] = "auto"  # CUDA only; auto picks bf16/fp16
+    QUANTIZE_INT8: bool = True  # CPU only; torch and onnx backends
+    JIT_MODE: bool = True  # torch backend only
+    EARLY_EXIT_HEADS: str = ""  # trained per-layer exit heads
+    EARLY_EXIT_THRESHOLD: float = 0.0  # entropy; 0 disables
     
     # Application
     APP_NAME: str = "AI Triage Agent"
     APP_VERSION: str = "0.1.0"
-    DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
-    
-    # Routing Configuration
-    CATEGORY_ROUTING: dict = {
-        "billing": {"jira_priority": "High", "slack_channel": "#billing"},
-        "technical": {"jira_priority": "Medium", "slack_channel": "#technical"},
-        "access": {"jira_priority": "High", "slack_channel": "#access"},
-        "general": {"jira_priority": "Low", "slack_channel": "#general"},
-    }
+    DEBUG: bool = False
+    
+    # Performance
+    BATCH_CONCURRENCY: int = 16
+    INFER_THREADS: int = Field(default_factory=lambda: os.cpu_count() or 1)
+    INFER_BATCH_SIZE: int = 32
+    TORCH_NUM_THREADS: int = 1  # intra-op threads per process
+    MICROBATCH_MAX_SIZE: int = 32
+    MICROBATCH_MAX_LATENCY_MS: float = 10.0
+    CLASSIFIER_CACHE_SIZE: int = 4096
+    WATSONX_CACHE_SIZE: int = 1024
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # Ticket size limits
+    MAX_TICKET_CHARS: int = 32000
+    CLASSIFIER_MAX_CHARS: int = 4096  # ~1000 WordPiece tokens; the tokenizer caps input at 512
+    STRICT_TEXT_LENGTH: bool = False
+    JIRA_DESC_MAX: int = 32000
+    
+    # Routing Configuration (override with CATEGORY_ROUTING as a JSON object)
+    CATEGORY_ROUTING: Mapping[str, RoutingConfig] = Field(default_factory=_default_category_routing)
+
 
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the application settings, read from the environment once"""
+    return Settings()
 
-settings = Settings()
 
+settings = get_settings()
@@ -0,0 +1,31 @@
+"""Process-wide pooled HTTP client shared by the integration services"""
+
+from typing import Optional
+import httpx
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP/2 client, creating it on first use
+    
+    Services pass their own auth and headers with each request, so Jira and
+    Slack calls draw from one connection pool. A closed client is replaced
+    on the next call.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=128, max_keepalive_connections=64),
+            timeout=10.0
+        )
+    return _client
+
+
+async def aclose_http_client():
+    """Close the shared HTTP client"""
+    if _client is not None:
+        await _client.aclose()
+
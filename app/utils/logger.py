@@ -1,5 +1,6 @@
 """Logging configuration"""
 
+from logging.handlers import RotatingFileHandler
 import logging
 import sys
 from pathlib import Path
@@ -15,14 +16,17 @@ def setup_logger(name: str = "ai_triage_agent", log_level: str = "INFO") -> logg
     if logger.handlers:
         return logger
     
+    # The handlers below emit every record; don't hand it to the root logger too
+    logger.propagate = False
+    
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     
-    # File handler
+    # File handler, rotated so the log cannot grow without bound
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
-    file_handler = logging.FileHandler(log_dir / "app.log")
+    file_handler = RotatingFileHandler(log_dir / "app.log", maxBytes=10 * 1024 * 1024, backupCount=5)
     file_handler.setLevel(logging.DEBUG)
     
     # Formatter